@@ -0,0 +1,155 @@
+"""Single-pass Numba kernels behind FlightEventDetector and the HF risk index."""
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    # Numba is optional; callers fall back to NumPy implementations without it
+    from numba import njit
+except Exception:  # pragma: no cover - numba may not be installed
+    njit = None
+
+# fastmath without the no-NaN/no-Inf assumptions: missing samples arrive as NaN
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+def _scan(
+    alt,
+    ias,
+    vs,
+    roll,
+    g,
+    alt_floor,
+    climb_fpm,
+    steep_deg,
+    stall_kt,
+    vne_kt,
+    g_pos,
+    g_neg,
+    max_stalls,
+    max_overspeed,
+    max_high_g,
+    steep_gap,
+    steep_min,
+):
+    """Walk the telemetry once and return the sample indices each detector fires on.
+
+    Missing channels are passed as all-NaN arrays, which never cross a threshold.
+    Returns ``(takeoff, stalls, overspeed, high_g, steep_starts, steep_counts, steep_peaks)``.
+    """
+    n = roll.shape[0]
+    takeoff = -1
+    stalls = np.empty(max_stalls, np.int64)
+    overspeed = np.empty(max_overspeed, np.int64)
+    high_g = np.empty(max_high_g, np.int64)
+    n_stalls = 0
+    n_overspeed = 0
+    n_high_g = 0
+
+    steep_starts = np.empty(n // steep_min + 1, np.int64)
+    steep_counts = np.empty(n // steep_min + 1, np.int64)
+    steep_peaks = np.empty(n // steep_min + 1, np.int64)
+    n_steep = 0
+    seg_start = -1
+    seg_last = -1
+    seg_count = 0
+    seg_peak = -1
+    seg_peak_val = 0.0
+
+    for i in range(n):
+        if takeoff < 0 and vs[i] > climb_fpm:
+            takeoff = i
+
+        speed = ias[i]
+        if n_stalls < max_stalls and speed < stall_kt and alt[i] > alt_floor:
+            stalls[n_stalls] = i
+            n_stalls += 1
+        if n_overspeed < max_overspeed and speed > vne_kt:
+            overspeed[n_overspeed] = i
+            n_overspeed += 1
+
+        load = g[i]
+        if n_high_g < max_high_g and (load > g_pos or load < g_neg):
+            high_g[n_high_g] = i
+            n_high_g += 1
+
+        bank = abs(roll[i])
+        if bank > steep_deg:
+            if seg_count > 0 and i - seg_last > steep_gap:
+                if seg_count >= steep_min:
+                    steep_starts[n_steep] = seg_start
+                    steep_counts[n_steep] = seg_count
+                    steep_peaks[n_steep] = seg_peak
+                    n_steep += 1
+                seg_count = 0
+            if seg_count == 0:
+                seg_start = i
+                seg_peak = i
+                seg_peak_val = bank
+            elif bank > seg_peak_val:
+                seg_peak = i
+                seg_peak_val = bank
+            seg_count += 1
+            seg_last = i
+
+    if seg_count >= steep_min:
+        steep_starts[n_steep] = seg_start
+        steep_counts[n_steep] = seg_count
+        steep_peaks[n_steep] = seg_peak
+        n_steep += 1
+
+    return (
+        takeoff,
+        stalls[:n_stalls],
+        overspeed[:n_overspeed],
+        high_g[:n_high_g],
+        steep_starts[:n_steep],
+        steep_counts[:n_steep],
+        steep_peaks[:n_steep],
+    )
+
+
+def _hf_component(value, offset, scale, take_abs):
+    x = (value - offset) / scale
+    if take_abs:
+        x = abs(x)
+    if x != x:
+        return 0.0
+    return min(max(x, 0.0), 1.2)
+
+
+def _hf_index(n, vs, roll, g, aoa, nz, present, params):
+    """Average the clipped HF components for every sample in one loop.
+
+    ``present[k]`` says whether component ``k`` exists (absent ones are passed as
+    empty arrays) and ``params[k]`` holds its ``(offset, scale, take_abs)``.
+    """
+    count = 0
+    for k in range(present.shape[0]):
+        if present[k]:
+            count += 1
+
+    out = np.empty(n, np.float32)
+    for i in range(n):
+        total = 0.0
+        if present[0]:
+            total += _hf_component(vs[i], params[0, 0], params[0, 1], params[0, 2] != 0)
+        if present[1]:
+            total += _hf_component(roll[i], params[1, 0], params[1, 1], params[1, 2] != 0)
+        if present[2]:
+            total += _hf_component(g[i], params[2, 0], params[2, 1], params[2, 2] != 0)
+        if present[3]:
+            total += _hf_component(aoa[i], params[3, 0], params[3, 1], params[3, 2] != 0)
+        if present[4]:
+            total += _hf_component(nz[i], params[4, 0], params[4, 1], params[4, 2] != 0)
+        out[i] = min(max(total / count * 80.0 + 10.0, 0.0), 100.0)
+    return out
+
+
+if njit is not None:
+    scan = njit(cache=True)(_scan)
+    _hf_component = njit(cache=True, fastmath=_FASTMATH)(_hf_component)
+    hf_index = njit(cache=True, fastmath=_FASTMATH)(_hf_index)
+else:
+    scan = None
+    hf_index = None
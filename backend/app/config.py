@@ -1,51 +1,100 @@
 """Application configuration and environment helpers."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from functools import lru_cache
 import os
 from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
+import pandas as pd
 
-# Load environment variables from .env if present
 ROOT_DIR = Path(__file__).resolve().parents[2]
-load_dotenv(ROOT_DIR / ".env", override=False)
-load_dotenv(ROOT_DIR / "apikey.env", override=False)
+_ENV_LOADED_FLAG = "NAVIGAITOR_ENV_LOADED"
+
+
+def _maybe_load_dotenv() -> None:
+    """Load .env files once per process tree; skipped if the environment is already set up."""
+    if os.getenv(_ENV_LOADED_FLAG):
+        return
+    load_dotenv(ROOT_DIR / ".env", override=False)
+    load_dotenv(ROOT_DIR / "apikey.env", override=False)
+    os.environ[_ENV_LOADED_FLAG] = "1"
+
+
+# Copy-on-Write lets column renames and slices share data with the parsed frame
+pd.options.mode.copy_on_write = True
 
 
 @dataclass(frozen=True)
 class Settings:
     """Strongly-typed configuration for the backend service."""
 
-    environment: str = os.getenv("ENVIRONMENT", "local")
-    log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    environment: str = "local"
+    log_level: str = "INFO"
 
     # API keys / auth
-    gemini_api_key: Optional[str] = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_AI_STUDIO_API_KEY")
-    youcom_api_key: Optional[str] = os.getenv("YOUCOM_API_KEY") or os.getenv("YOU_COM_API_KEY")
+    gemini_api_key: Optional[str] = None
+    youcom_api_key: Optional[str] = None
 
     # Vertex AI specific configuration
-    vertex_project: Optional[str] = os.getenv("VERTEX_PROJECT")
-    vertex_location: str = os.getenv("VERTEX_LOCATION", "us-central1")
-    vertex_model: str = os.getenv("VERTEX_MODEL", "gemini-2.5-pro")
-    gemini_model: str = os.getenv("GEMINI_MODEL", "gemini-2.5-pro")
+    vertex_project: Optional[str] = None
+    vertex_location: str = "us-central1"
+    vertex_model: str = "gemini-2.5-pro"
+    gemini_model: str = "gemini-2.5-pro"
 
     # Analysis defaults
-    max_chart_points: int = int(os.getenv("MAX_CHART_POINTS", "500"))
-    max_reference_event_types: int = int(os.getenv("MAX_REFERENCE_EVENT_TYPES", "3"))
+    max_chart_points: int = 500
+    # The signal strip zooms into 25-40 s preset windows, so it needs near full resolution
+    max_signal_points: int = 100_000
+    max_reference_event_types: int = 3
+    max_rule_events: int = 500
+    analysis_cache_size: int = 16
 
     # Data directories (optional, for local testing)
     general_aviation_dir: Path = ROOT_DIR / "100_flights_avionics_only" / "data_log"
     military_dir: Path = ROOT_DIR / "Defense data" / "Hackathon Defense Data"
 
-    @property
-    def use_vertex(self) -> bool:
-        """Whether to route Gemini requests through Vertex AI."""
-        return bool(self.vertex_project and self.vertex_location)
+    # Whether to route Gemini requests through Vertex AI (derived in load())
+    use_vertex: bool = False
+
+    @classmethod
+    def load(cls) -> "Settings":
+        """Read the environment once; unset variables fall back to the field defaults."""
+        env = os.environ
+        overrides = {}
+        for name, keys in _ENV_VARS.items():
+            value = next((env[key] for key in keys if env.get(key)), None)
+            if value is None:
+                continue
+            # Integer fields are cast from their string env values
+            overrides[name] = int(value) if isinstance(getattr(cls, name), int) else value
+        settings = cls(**overrides)
+        return replace(settings, use_vertex=bool(settings.vertex_project and settings.vertex_location))
+
+
+# Settings field -> environment variables checked in order; the first non-empty one wins
+_ENV_VARS = {
+    "environment": ("ENVIRONMENT",),
+    "log_level": ("LOG_LEVEL",),
+    "gemini_api_key": ("GEMINI_API_KEY", "GOOGLE_AI_STUDIO_API_KEY"),
+    "youcom_api_key": ("YOUCOM_API_KEY", "YOU_COM_API_KEY"),
+    "vertex_project": ("VERTEX_PROJECT",),
+    "vertex_location": ("VERTEX_LOCATION",),
+    "vertex_model": ("VERTEX_MODEL",),
+    "gemini_model": ("GEMINI_MODEL",),
+    "max_chart_points": ("MAX_CHART_POINTS",),
+    "max_signal_points": ("MAX_SIGNAL_POINTS",),
+    "max_reference_event_types": ("MAX_REFERENCE_EVENT_TYPES",),
+    "max_rule_events": ("MAX_RULE_EVENTS",),
+    "analysis_cache_size": ("ANALYSIS_CACHE_SIZE",),
+}
 
 
 @lru_cache()
 def get_settings() -> Settings:
-    return Settings()
+    return Settings.load()
+
+
+_maybe_load_dotenv()
@@ -2,14 +2,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from functools import cached_property
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import warnings
 
 import numpy as np
 import pandas as pd
 
+from ._event_kernels import scan
+
 
 @dataclass
 class Event:
+    # Declared by hand rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("type", "time_seconds", "severity", "description", "payload")
+
     type: str
     time_seconds: float
     severity: str
@@ -17,20 +24,170 @@ class Event:
     payload: Dict[str, Any]
 
     def as_dict(self) -> Dict[str, Any]:
-        data = {
+        return {
             "type": self.type,
             "time_seconds": self.time_seconds,
             "severity": self.severity,
             "description": self.description,
+            **self.payload,
         }
-        data.update(self.payload)
-        return data
+
+
+@dataclass(frozen=True)
+class FlightArrays:
+    """NumPy views of the telemetry channels, shared by detection and summary."""
+
+    COLUMNS = (
+        "alt_msl_ft",
+        "airspeed_indicated_kt",
+        "vertical_speed_fpm",
+        "roll_deg",
+        "normal_accel_g",
+        "time_seconds",
+        "fuel_qty_left_gal",
+        "fuel_qty_right_gal",
+    )
+
+    columns: Dict[str, np.ndarray]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "FlightArrays":
+        return cls({name: df[name].to_numpy() for name in cls.COLUMNS if name in df.columns})
+
+
+class _Stats(NamedTuple):
+    min: float
+    max: float
+    mean: float
+
+
+def _reduce(values: np.ndarray) -> _Stats:
+    if values.size == 0:
+        return _Stats(np.nan, np.nan, np.nan)
+    with warnings.catch_warnings():
+        # All-NaN channels reduce to NaN, matching the pandas reductions
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return _Stats(
+            float(np.nanmin(values)),
+            float(np.nanmax(values)),
+            float(np.nanmean(values, dtype=np.float64)),
+        )
 
 
 class FlightEventDetector:
-    def __init__(self, df: pd.DataFrame):
-        self.df = df.fillna(0)
+    CLIMB_FPM = 300
+    STEEP_BANK_DEG = 30
+    STALL_IAS_KT = 50
+    VNE_KT = 200
+    G_POS, G_NEG = 3.8, -1.52
+    MAX_STALLS = 5
+    MAX_OVERSPEED = 10
+    MAX_HIGH_G = 10
+    STEEP_GAP = 5
+    STEEP_MIN_SAMPLES = 3
+
+    def __init__(self, df: pd.DataFrame, arrays: Optional[FlightArrays] = None):
+        # NaN compares False against every threshold, so no fill/copy is needed
+        self.df = df
         self.events: List[Event] = []
+        self._arr: Dict[str, np.ndarray] = (arrays or FlightArrays.from_frame(df)).columns
+
+    def _get(self, column: str, idx: int, default: float = 0.0) -> float:
+        arr = self._arr.get(column)
+        return float(np.nan_to_num(arr[idx])) if arr is not None else default
+
+    @cached_property
+    def _hits(self) -> Dict[str, Any]:
+        """Sample indices each threshold detector fires on, from one scan of the columns."""
+        if scan is not None and "roll_deg" in self._arr:
+            return self._hits_kernel()
+        return self._hits_numpy()
+
+    def _hits_kernel(self) -> Dict[str, Any]:
+        n = len(self._arr["roll_deg"])
+        missing = np.full(n, np.nan)
+        alt, ias, vs, roll, g = (
+            self._arr.get(name, missing)
+            for name in ("alt_msl_ft", "airspeed_indicated_kt", "vertical_speed_fpm", "roll_deg", "normal_accel_g")
+        )
+        takeoff, stalls, overspeed, high_g, starts, counts, peaks = scan(
+            alt,
+            ias,
+            vs,
+            roll,
+            g,
+            self._alt_floor(),
+            self.CLIMB_FPM,
+            self.STEEP_BANK_DEG,
+            self.STALL_IAS_KT,
+            self.VNE_KT,
+            self.G_POS,
+            self.G_NEG,
+            self.MAX_STALLS,
+            self.MAX_OVERSPEED,
+            self.MAX_HIGH_G,
+            self.STEEP_GAP,
+            self.STEEP_MIN_SAMPLES,
+        )
+        return {
+            "climb": np.array([takeoff] if takeoff >= 0 else [], dtype=np.int64),
+            "stall": stalls,
+            "overspeed": overspeed,
+            "high_g": high_g,
+            "steep": (starts, counts, peaks),
+        }
+
+    def _hits_numpy(self) -> Dict[str, Any]:
+        vs = self._arr.get("vertical_speed_fpm")
+        roll = self._arr.get("roll_deg")
+        ias = self._arr.get("airspeed_indicated_kt")
+        alt = self._arr.get("alt_msl_ft")
+        g = self._arr.get("normal_accel_g")
+
+        none = np.empty(0, dtype=np.int64)
+        hits: Dict[str, Any] = {
+            "climb": none,
+            "stall": none,
+            "overspeed": none,
+            "high_g": none,
+            "steep": (none, none, none),
+        }
+        if vs is not None:
+            hits["climb"] = np.flatnonzero(np.greater(vs, self.CLIMB_FPM))[:1]
+        if roll is not None:
+            hits["steep"] = self._steep_segments(roll)
+        if ias is not None:
+            hits["overspeed"] = np.flatnonzero(np.greater(ias, self.VNE_KT))[: self.MAX_OVERSPEED]
+            if alt is not None:
+                stall = np.less(ias, self.STALL_IAS_KT) & np.greater(alt, self._alt_floor())
+                hits["stall"] = np.flatnonzero(stall)[: self.MAX_STALLS]
+        if g is not None:
+            high_g = np.logical_or(np.greater(g, self.G_POS), np.less(g, self.G_NEG))
+            hits["high_g"] = np.flatnonzero(high_g)[: self.MAX_HIGH_G]
+        return hits
+
+    def _alt_floor(self) -> float:
+        alt = self._arr.get("alt_msl_ft")
+        if alt is None or np.isnan(alt).all():
+            return np.nan
+        return float(np.nanmin(alt)) + 500
+
+    def _steep_segments(self, roll: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Positions of steep samples; gaps of up to STEEP_GAP samples stay in the same turn.
+        steep = np.flatnonzero(np.abs(roll) > self.STEEP_BANK_DEG)
+        if steep.size == 0:
+            return steep, steep, steep
+
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(steep) > self.STEEP_GAP) + 1))
+        counts = np.diff(np.append(starts, steep.size))
+        keep = counts >= self.STEEP_MIN_SAMPLES
+        starts, counts = starts[keep], counts[keep]
+
+        steep_abs = np.abs(roll[steep])
+        peaks = np.array(
+            [steep[s + int(np.argmax(steep_abs[s:s + c]))] for s, c in zip(starts, counts)], dtype=np.int64
+        )
+        return steep[starts], counts, peaks
 
     def detect_all_events(self) -> List[Dict[str, Any]]:
         detectors = [
@@ -51,23 +208,20 @@ class FlightEventDetector:
 
     def detect_takeoff(self) -> List[Event]:
         events: List[Event] = []
-        if "vertical_speed_fpm" not in self.df.columns:
+        climbing = self._hits["climb"]
+        if climbing.size == 0:
             return events
 
-        climbing = self.df[self.df["vertical_speed_fpm"] > 300]
-        if climbing.empty:
-            return events
-
-        idx = climbing.index[0]
+        idx = int(climbing[0])
         events.append(
             Event(
                 type="TAKEOFF",
-                time_seconds=float(self.df.loc[idx, "time_seconds"]),
+                time_seconds=self._get("time_seconds", idx),
                 severity="info",
                 description="Takeoff detected via sustained climb",
                 payload={
-                    "altitude_ft": float(self.df.get("alt_msl_ft", pd.Series([0])).iloc[idx] if "alt_msl_ft" in self.df.columns else 0),
-                    "airspeed_kt": float(self.df.get("airspeed_indicated_kt", pd.Series([0])).iloc[idx] if "airspeed_indicated_kt" in self.df.columns else 0),
+                    "altitude_ft": self._get("alt_msl_ft", idx),
+                    "airspeed_kt": self._get("airspeed_indicated_kt", idx),
                 },
             )
         )
@@ -75,24 +229,27 @@ class FlightEventDetector:
 
     def detect_landing(self) -> List[Event]:
         events: List[Event] = []
-        if "alt_msl_ft" not in self.df.columns:
+        alt = self._arr.get("alt_msl_ft")
+        if alt is None:
             return events
 
-        last_segment = self.df.tail(max(3, int(len(self.df) * 0.2)))
-        low_alt = last_segment[last_segment["alt_msl_ft"] < 300]
-        if low_alt.empty:
+        # Only the last 20% of the flight (at least 3 samples) is searched
+        n = len(alt)
+        start = max(n - max(3, n // 5), 0)
+        hits = np.flatnonzero(alt[start:] < 300)
+        if hits.size == 0:
             return events
 
-        idx = low_alt.index[-1]
+        idx = start + int(hits[-1])
         events.append(
             Event(
                 type="LANDING",
-                time_seconds=float(self.df.loc[idx, "time_seconds"]),
+                time_seconds=self._get("time_seconds", idx),
                 severity="info",
                 description="Landing detected near ground with descent",
                 payload={
-                    "vertical_speed_fpm": float(self.df.get("vertical_speed_fpm", pd.Series([0])).iloc[idx] if "vertical_speed_fpm" in self.df.columns else 0),
-                    "airspeed_kt": float(self.df.get("airspeed_indicated_kt", pd.Series([0])).iloc[idx] if "airspeed_indicated_kt" in self.df.columns else 0),
+                    "vertical_speed_fpm": self._get("vertical_speed_fpm", idx),
+                    "airspeed_kt": self._get("airspeed_indicated_kt", idx),
                 },
             )
         )
@@ -100,30 +257,23 @@ class FlightEventDetector:
 
     def detect_steep_turns(self) -> List[Event]:
         events: List[Event] = []
-        if "roll_deg" not in self.df.columns:
-            return events
-
-        steep = self.df[self.df["roll_deg"].abs() > 30].copy()
-        if steep.empty:
+        starts, counts, peaks = self._hits["steep"]
+        if starts.size == 0:
             return events
 
-        steep["group"] = (steep.index.to_series().diff().fillna(0) > 5).cumsum()
-        for _, group in steep.groupby("group"):
-            if len(group) < 3:
-                continue
-            max_bank_idx = group["roll_deg"].abs().idxmax()
-            max_bank = group.loc[max_bank_idx, "roll_deg"]
-            severity = "warning" if abs(max_bank) > 45 else "info"
+        roll = self._arr["roll_deg"]
+        for start, count, peak in zip(starts, counts, peaks):
+            bank = float(roll[peak])
             events.append(
                 Event(
                     type="STEEP_TURN",
-                    time_seconds=float(group.loc[max_bank_idx, "time_seconds"]),
-                    severity=severity,
-                    description=f"Steep turn {abs(max_bank):.1f}° over {len(group)}s",
+                    time_seconds=self._get("time_seconds", peak),
+                    severity="warning" if abs(bank) > 45 else "info",
+                    description=f"Steep turn {abs(bank):.1f}° over {count}s",
                     payload={
-                        "max_bank_deg": float(max_bank),
-                        "duration_seconds": int(len(group)),
-                        "altitude_ft": float(group.get("alt_msl_ft", pd.Series([0])).iloc[0] if "alt_msl_ft" in group.columns else 0),
+                        "max_bank_deg": bank,
+                        "duration_seconds": int(count),
+                        "altitude_ft": self._get("alt_msl_ft", start),
                     },
                 )
             )
@@ -131,21 +281,23 @@ class FlightEventDetector:
 
     def detect_stalls(self) -> List[Event]:
         events: List[Event] = []
-        if "airspeed_indicated_kt" not in self.df.columns or "alt_msl_ft" not in self.df.columns:
+        suspected = self._hits["stall"]
+        if suspected.size == 0:
             return events
 
-        min_alt = self.df["alt_msl_ft"].min()
-        suspected = self.df[(self.df["airspeed_indicated_kt"] < 50) & (self.df["alt_msl_ft"] > min_alt + 500)]
-        for idx in suspected.index[:5]:
+        ias = self._arr["airspeed_indicated_kt"]
+        alt = self._arr["alt_msl_ft"]
+        for idx in suspected:
+            speed, altitude = float(ias[idx]), float(alt[idx])
             events.append(
                 Event(
                     type="STALL_WARNING",
-                    time_seconds=float(self.df.loc[idx, "time_seconds"]),
+                    time_seconds=self._get("time_seconds", idx),
                     severity="critical",
-                    description=f"Low airspeed {self.df.loc[idx, 'airspeed_indicated_kt']:.0f} kt at {self.df.loc[idx, 'alt_msl_ft']:.0f} ft",
+                    description=f"Low airspeed {speed:.0f} kt at {altitude:.0f} ft",
                     payload={
-                        "airspeed_kt": float(self.df.loc[idx, "airspeed_indicated_kt"]),
-                        "altitude_ft": float(self.df.loc[idx, "alt_msl_ft"]),
+                        "airspeed_kt": speed,
+                        "altitude_ft": altitude,
                     },
                 )
             )
@@ -153,22 +305,23 @@ class FlightEventDetector:
 
     def detect_overspeed(self) -> List[Event]:
         events: List[Event] = []
-        if "airspeed_indicated_kt" not in self.df.columns:
+        overspeed = self._hits["overspeed"]
+        if overspeed.size == 0:
             return events
 
-        VNE = 200
-        overspeed = self.df[self.df["airspeed_indicated_kt"] > VNE]
-        for idx in overspeed.index[:10]:
+        ias = self._arr["airspeed_indicated_kt"]
+        for idx in overspeed:
+            speed = float(ias[idx])
             events.append(
                 Event(
                     type="OVERSPEED",
-                    time_seconds=float(self.df.loc[idx, "time_seconds"]),
+                    time_seconds=self._get("time_seconds", idx),
                     severity="critical",
-                    description=f"Overspeed {self.df.loc[idx, 'airspeed_indicated_kt']:.0f} kt (Vne {VNE})",
+                    description=f"Overspeed {speed:.0f} kt (Vne {self.VNE_KT})",
                     payload={
-                        "airspeed_kt": float(self.df.loc[idx, "airspeed_indicated_kt"]),
-                        "vne_kt": VNE,
-                        "altitude_ft": float(self.df.get("alt_msl_ft", pd.Series([0])).iloc[idx] if "alt_msl_ft" in self.df.columns else 0),
+                        "airspeed_kt": speed,
+                        "vne_kt": self.VNE_KT,
+                        "altitude_ft": self._get("alt_msl_ft", idx),
                     },
                 )
             )
@@ -176,63 +329,62 @@ class FlightEventDetector:
 
     def detect_high_g(self) -> List[Event]:
         events: List[Event] = []
-        if "normal_accel_g" not in self.df.columns:
+        exceed = self._hits["high_g"]
+        if exceed.size == 0:
             return events
 
-        g_pos, g_neg = 3.8, -1.52
-        exceed = self.df[(self.df["normal_accel_g"] > g_pos) | (self.df["normal_accel_g"] < g_neg)]
-        for idx in exceed.index[:10]:
-            g_load = self.df.loc[idx, "normal_accel_g"]
+        g = self._arr["normal_accel_g"]
+        for idx in exceed:
+            g_load = float(g[idx])
             events.append(
                 Event(
                     type="HIGH_G_LOAD",
-                    time_seconds=float(self.df.loc[idx, "time_seconds"]),
+                    time_seconds=self._get("time_seconds", idx),
                     severity="warning",
                     description=f"High G load {g_load:.2f}G",
                     payload={
-                        "g_load": float(g_load),
-                        "altitude_ft": float(self.df.get("alt_msl_ft", pd.Series([0])).iloc[idx] if "alt_msl_ft" in self.df.columns else 0),
+                        "g_load": g_load,
+                        "altitude_ft": self._get("alt_msl_ft", idx),
                     },
                 )
             )
         return events
 
 
-def compute_flight_summary(df: pd.DataFrame) -> Dict[str, Any]:
+def compute_flight_summary(df: pd.DataFrame, arrays: Optional[FlightArrays] = None) -> Dict[str, Any]:
+    cols = (arrays or FlightArrays.from_frame(df)).columns
     summary: Dict[str, Any] = {
         "total_duration_seconds": int(len(df)),
         "total_duration_minutes": round(len(df) / 60, 1),
     }
 
-    if "alt_msl_ft" in df.columns:
-        summary["max_altitude_ft"] = float(df["alt_msl_ft"].max())
-        summary["min_altitude_ft"] = float(df["alt_msl_ft"].min())
-        summary["avg_altitude_ft"] = float(df["alt_msl_ft"].mean())
-
-    if "airspeed_indicated_kt" in df.columns:
-        summary["max_airspeed_kt"] = float(df["airspeed_indicated_kt"].max())
-        summary["avg_airspeed_kt"] = float(df["airspeed_indicated_kt"].mean())
-
-    if "vertical_speed_fpm" in df.columns:
-        summary["max_climb_rate_fpm"] = float(df["vertical_speed_fpm"].max())
-        summary["max_descent_rate_fpm"] = float(df["vertical_speed_fpm"].min())
-
-    if "roll_deg" in df.columns:
-        summary["max_bank_angle_deg"] = float(df["roll_deg"].abs().max())
-
-    if "normal_accel_g" in df.columns:
-        summary["max_positive_g"] = float(df["normal_accel_g"].max())
-        summary["max_negative_g"] = float(df["normal_accel_g"].min())
-
-    if {"fuel_qty_left_gal", "fuel_qty_right_gal"}.issubset(df.columns):
-        left = pd.to_numeric(df["fuel_qty_left_gal"], errors="coerce")
-        right = pd.to_numeric(df["fuel_qty_right_gal"], errors="coerce")
-        initial = (left.iloc[0] if not pd.isna(left.iloc[0]) else 0) + (
-            right.iloc[0] if not pd.isna(right.iloc[0]) else 0
-        )
-        final = (left.iloc[-1] if not pd.isna(left.iloc[-1]) else 0) + (
-            right.iloc[-1] if not pd.isna(right.iloc[-1]) else 0
-        )
-        summary["fuel_consumed_gal"] = float(initial - final)
+    if "alt_msl_ft" in cols:
+        alt = _reduce(cols["alt_msl_ft"])
+        summary["max_altitude_ft"] = alt.max
+        summary["min_altitude_ft"] = alt.min
+        summary["avg_altitude_ft"] = alt.mean
+
+    if "airspeed_indicated_kt" in cols:
+        ias = _reduce(cols["airspeed_indicated_kt"])
+        summary["max_airspeed_kt"] = ias.max
+        summary["avg_airspeed_kt"] = ias.mean
+
+    if "vertical_speed_fpm" in cols:
+        vs = _reduce(cols["vertical_speed_fpm"])
+        summary["max_climb_rate_fpm"] = vs.max
+        summary["max_descent_rate_fpm"] = vs.min
+
+    if "roll_deg" in cols:
+        summary["max_bank_angle_deg"] = _reduce(np.abs(cols["roll_deg"])).max
+
+    if "normal_accel_g" in cols:
+        g = _reduce(cols["normal_accel_g"])
+        summary["max_positive_g"] = g.max
+        summary["max_negative_g"] = g.min
+
+    if "fuel_qty_left_gal" in cols and "fuel_qty_right_gal" in cols:
+        left, right = cols["fuel_qty_left_gal"], cols["fuel_qty_right_gal"]
+        fuel = np.nan_to_num(np.array([left[0], right[0], left[-1], right[-1]], dtype=np.float64))
+        summary["fuel_consumed_gal"] = float(fuel[0] + fuel[1] - fuel[2] - fuel[3])
 
     return summary
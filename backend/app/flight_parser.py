@@ -3,15 +3,38 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from io import BytesIO
+import logging
 import re
-from typing import Dict, Tuple
+from typing import BinaryIO, Dict, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
 from .config import get_settings
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
+try:
+    # PyArrow's CSV reader is optional; pandas is used when it is missing
+    import pyarrow.csv as pacsv
+except Exception:  # pragma: no cover - pyarrow may not be installed
+    pacsv = None
+
+_META_RE = re.compile(r"(\w+)=\"([^\"]+)\"")
+
+
+def _read_preamble(stream: BinaryIO) -> Tuple[bytes, bytes]:
+    """Return the first line and the CSV header, leaving ``stream`` positioned at the header."""
+    first_line = stream.readline()
+    offset = 0
+    line = first_line
+    while line and (not line.strip() or line.lstrip().startswith(b"#")):
+        offset = stream.tell()
+        line = stream.readline()
+    stream.seek(offset)
+    return first_line, line.strip()
+
 
 @dataclass
 class ParsedFlight:
@@ -76,10 +99,13 @@ class FlightDataParser:
         "RIGHT_ENGINE_RPM_N1": "right_engine_rpm_pct",
     }
 
-    def parse(self, file_bytes: bytes) -> ParsedFlight:
-        df = self._read_csv(file_bytes)
-        metadata = self._parse_metadata(file_bytes)
-        aircraft_type = self._detect_aircraft_type(df)
+    def parse(self, stream: BinaryIO) -> ParsedFlight:
+        first_line, header = _read_preamble(stream)
+        metadata = self._parse_metadata(first_line)
+        aircraft_type = self._detect_aircraft_type_from_header(header)
+        df = self._read_csv(stream)
+        if aircraft_type is None:
+            aircraft_type = self._detect_aircraft_type(df)
         metadata["detected_aircraft"] = aircraft_type
 
         normalized_df = self._normalize(df, aircraft_type)
@@ -87,31 +113,59 @@ class FlightDataParser:
 
         return ParsedFlight(normalized_df.reset_index(drop=True), metadata)
 
-    def _read_csv(self, file_bytes: bytes) -> pd.DataFrame:
+    def _read_csv(self, stream: BinaryIO) -> pd.DataFrame:
+        # The stream sits on the header row; every reader below starts from there
+        start = stream.tell()
+        df = self._read_csv_arrow(stream)
+        if df is not None:
+            df.columns = [str(c).strip() for c in df.columns]
+            return df
+
+        # Without pyarrow (or if Arrow rejects the file) use the C engine in one pass
         try:
-            df = pd.read_csv(BytesIO(file_bytes), comment="#", low_memory=False)
+            stream.seek(start)
+            df = pd.read_csv(stream, engine="c", comment="#", low_memory=False, cache_dates=True)
         except Exception:
-            lines = file_bytes.decode("utf-8", errors="ignore").splitlines()
-            data_start = 0
-            for i, line in enumerate(lines):
-                if line and not line.startswith("#"):
-                    data_start = i
-                    break
-            csv_data = "\n".join(lines[data_start:])
-            df = pd.read_csv(BytesIO(csv_data.encode()), low_memory=False)
+            stream.seek(start)
+            df = pd.read_csv(stream, engine="c", low_memory=False, cache_dates=True)
         df.columns = [str(c).strip() for c in df.columns]
         return df
 
-    def _parse_metadata(self, file_bytes: bytes) -> Dict[str, str]:
-        lines = file_bytes.decode("utf-8", errors="ignore").splitlines()
+    def _read_csv_arrow(self, stream: BinaryIO) -> Optional[pd.DataFrame]:
+        if pacsv is None:
+            return None
+
+        # Arrow has no comment option; the '#' metadata and unit rows were skipped by _read_preamble
+        try:
+            table = pacsv.read_csv(
+                stream,
+                parse_options=pacsv.ParseOptions(delimiter=","),
+                convert_options=pacsv.ConvertOptions(strings_can_be_null=True),
+            )
+        except Exception as exc:
+            logger.debug("Arrow CSV parse failed, falling back to pandas: %s", exc)
+            return None
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def _parse_metadata(self, first_line: bytes) -> Dict[str, str]:
         metadata: Dict[str, str] = {}
 
-        if lines and lines[0].startswith("#airframe_info"):
-            for match in re.finditer(r"(\w+)=\"([^\"]+)\"", lines[0]):
+        # Only the first line carries metadata
+        if first_line.startswith(b"#airframe_info"):
+            for match in _META_RE.finditer(first_line.decode("utf-8", errors="ignore")):
                 metadata[match.group(1)] = match.group(2)
 
         return metadata
 
+    def _detect_aircraft_type_from_header(self, header: bytes) -> Optional[str]:
+        # Exact column names, as in _detect_aircraft_type, so e.g. IRIG_TIME_SRC does not match
+        columns = {name.strip().strip(b'"').strip() for name in header.lower().split(b",")}
+        if b"irig_time" in columns:
+            return "T38C"
+        if b"lcl time" in columns or b"lcl date" in columns:
+            return "CIRRUS_SR20"
+        return None
+
     def _detect_aircraft_type(self, df: pd.DataFrame) -> str:
         columns_lower = [str(c).strip().lower() for c in df.columns]
         if "irig_time" in columns_lower:
@@ -122,13 +176,10 @@ class FlightDataParser:
 
     def _normalize(self, df: pd.DataFrame, aircraft_type: str) -> pd.DataFrame:
         column_map = self.T38_COLUMN_MAP if aircraft_type == "T38C" else self.GARMIN_COLUMN_MAP
-        normalized = df.copy()
-
-        for original, standard in column_map.items():
-            if original in normalized.columns:
-                normalized[standard] = normalized[original]
+        present = {original: standard for original, standard in column_map.items() if original in df.columns}
+        normalized = df.rename(columns=present, copy=False)
 
-        normalized["time_seconds"] = range(len(normalized))
+        normalized["time_seconds"] = np.arange(len(normalized), dtype=np.float32)
 
         numeric_columns = [
             "alt_msl_ft",
@@ -145,31 +196,38 @@ class FlightDataParser:
             "fuel_flow_gph",
             "fuel_qty_left_gal",
             "fuel_qty_right_gal",
+            # T-38 channels charted by the signal strip and read by the HF index / rules
+            "egi_altitude",
+            "adc_true_airspeed",
+            "adc_aoa_corrected",
+            "nz_normal_accel",
+            "roll_rate_p",
+            "pitch_rate_q",
         ]
 
-        for col in numeric_columns:
-            if col in normalized.columns:
-                normalized[col] = pd.to_numeric(normalized[col], errors="coerce")
+        # Coerce in one block write; channels stay float64 so reported values keep their precision
+        present_numeric = [col for col in numeric_columns if col in normalized.columns]
+        if present_numeric:
+            normalized[present_numeric] = normalized[present_numeric].apply(
+                pd.to_numeric, errors="coerce"
+            )
 
         if "afcs_on" in normalized.columns:
-            normalized["afcs_on"] = (
-                normalized["afcs_on"]
-                .astype(str)
-                .str.strip()
-                .str.lower()
-                .apply(lambda x: 1 if x in {"1", "true", "on", "y"} else 0)
-            )
+            afcs = normalized["afcs_on"].astype("string").str.strip().str.lower()
+            normalized["afcs_on"] = afcs.isin(["1", "true", "on", "y"]).astype(np.int8)
 
         return normalized
 
 
-def parse_flight(file_bytes: bytes) -> pd.DataFrame:
-    parser = FlightDataParser()
-    parsed = parser.parse(file_bytes)
-    return parsed.dataframe
+def _parse(source: Union[bytes, BinaryIO]) -> ParsedFlight:
+    stream = BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+    return FlightDataParser().parse(stream)
+
+
+def parse_flight(source: Union[bytes, BinaryIO]) -> pd.DataFrame:
+    return _parse(source).dataframe
 
 
-def parse_flight_with_metadata(file_bytes: bytes) -> Tuple[pd.DataFrame, Dict[str, str]]:
-    parser = FlightDataParser()
-    parsed = parser.parse(file_bytes)
+def parse_flight_with_metadata(source: Union[bytes, BinaryIO]) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    parsed = _parse(source)
     return parsed.dataframe, parsed.metadata
@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional
+import textwrap
+from typing import Any, Dict, Iterator, List, Optional
 
 from google import genai
 
@@ -20,6 +21,45 @@ except Exception:  # pragma: no cover - vertex may not be installed/configured
     GenerativeModel = None
 
 
+_REFERENCES_HEADER = "\n\nRegulatory References (CITE THESE IN YOUR DEBRIEF):\n"
+
+_PROMPT_TEMPLATE = textwrap.dedent(
+    """\
+    You are a Certified Flight Instructor (CFI) creating a post-flight debrief.
+
+    Flight Summary:
+    - Duration: {duration_minutes} minutes
+    - Max Altitude: {max_altitude_ft:.0f} ft MSL
+    - Max Airspeed: {max_airspeed_kt:.0f} kt
+    - Max Bank Angle: {max_bank_angle_deg:.1f}°
+    - Max Positive G: {max_positive_g:.2f}G
+    - Fuel Consumed: {fuel_consumed_gal:.1f} gallons
+
+    Critical Events ({critical_count}):
+    {critical_events}
+
+    Warning Events ({warning_count}):
+    {warning_events}
+
+    Info Events ({info_count}):
+    {info_events}
+
+    {refs_text}
+
+    Instructions:
+    1. Flight Overview: Brief summary of the flight profile.
+    2. What Went Well: Highlight 2-3 positive aspects with specifics.
+    3. Event Analysis: For each critical/warning/info event, explain the concern and **cite the relevant regulatory reference by number** (e.g., "According to [1], steep turns require..."). Use the snippets to provide authoritative guidance.
+    4. Training Recommendations: Three concrete, actionable items for next flight.
+    5. Closing: Professional yet encouraging safety notes.
+
+    IMPORTANT: Actively reference and cite the regulatory sources provided above using [1], [2], etc. notation. Make the citations feel natural and educational.
+
+    Target length: 350-450 words.
+    """
+)
+
+
 class GeminiDebriefGenerator:
     def __init__(self, *, model: Optional[str] = None):
         default_model = settings.vertex_model if settings.use_vertex else settings.gemini_model
@@ -40,72 +80,66 @@ class GeminiDebriefGenerator:
             self.vertex_model = None
 
     def generate_text(self, prompt: str) -> str:
+        return "".join(self.generate_text_stream(prompt))
+
+    def generate_text_stream(self, prompt: str) -> Iterator[str]:
+        """Yield response text as the model produces it."""
         try:
             if self._use_vertex and self.vertex_model:
-                response = self.vertex_model.generate_content(prompt)
-                return response.text or ""
+                for chunk in self.vertex_model.generate_content(prompt, stream=True):
+                    yield chunk.text or ""
+                return
             assert self.client is not None
-            response = self.client.models.generate_content(
+            for chunk in self.client.models.generate_content_stream(
                 model=self.model_name,
                 contents=[{"role": "user", "parts": [{"text": prompt}]}],
-            )
-            parts = response.candidates[0].content.parts
-            return "".join(part.text or "" for part in parts)
+            ):
+                if not chunk.candidates or not chunk.candidates[0].content:
+                    continue
+                yield "".join(part.text or "" for part in chunk.candidates[0].content.parts or [])
         except Exception as exc:  # pragma: no cover - network
             logger.error("Gemini generation failed: %s", exc)
-            return f"Error generating debrief: {exc}"
+            yield f"Error generating debrief: {exc}"
 
     def generate_debrief(self, flight_summary: Dict[str, Any], events: List[Dict[str, Any]], references: List[Dict[str, Any]]) -> str:
         prompt = self._build_prompt(flight_summary, events, references)
         return self.generate_text(prompt)
 
     def _build_prompt(self, flight_summary: Dict[str, Any], events: List[Dict[str, Any]], references: List[Dict[str, Any]]) -> str:
-        critical = [e for e in events if e.get("severity") == "critical"]
-        warning = [e for e in events if e.get("severity") == "warning"]
-        info = [e for e in events if e.get("severity") == "info"]
+        buckets: Dict[str, List[Dict[str, Any]]] = {"critical": [], "warning": [], "info": []}
+        for event in events:
+            bucket = buckets.get(event.get("severity"))
+            if bucket is not None:
+                bucket.append(event)
+        critical, warning, info = buckets["critical"], buckets["warning"], buckets["info"]
 
-        refs_text = "\n\nRegulatory References (CITE THESE IN YOUR DEBRIEF):\n"
         if references:
-            for i, ref in enumerate(references, 1):
-                refs_text += f"[{i}] {ref.get('event_type', 'GENERAL').replace('_', ' ')} - {ref.get('title')}\n"
-                refs_text += f"    Source: {ref.get('domain', 'faa.gov')}\n"
-                refs_text += f"    Key Point: {ref.get('snippet', '')[:200]}...\n\n"
+            refs_body = "".join(
+                f"[{i}] {ref.get('event_type', 'GENERAL').replace('_', ' ')} - {ref.get('title')}\n"
+                f"    Source: {ref.get('domain', 'faa.gov')}\n"
+                f"    Key Point: {ref.get('snippet', '')[:200]}...\n\n"
+                for i, ref in enumerate(references, 1)
+            )
         else:
-            refs_text += "- None available\n"
-
-        prompt = f"""You are a Certified Flight Instructor (CFI) creating a post-flight debrief.
-
-Flight Summary:
-- Duration: {flight_summary.get('total_duration_minutes', 0)} minutes
-- Max Altitude: {flight_summary.get('max_altitude_ft', 0):.0f} ft MSL
-- Max Airspeed: {flight_summary.get('max_airspeed_kt', 0):.0f} kt
-- Max Bank Angle: {flight_summary.get('max_bank_angle_deg', 0):.1f}°
-- Max Positive G: {flight_summary.get('max_positive_g', 1.0):.2f}G
-- Fuel Consumed: {flight_summary.get('fuel_consumed_gal', 0):.1f} gallons
-
-Critical Events ({len(critical)}):
-{self._format_events(critical)}
-
-Warning Events ({len(warning)}):
-{self._format_events(warning)}
-
-Info Events ({len(info)}):
-{self._format_events(info)}
-
-{refs_text}
-
-Instructions:
-1. Flight Overview: Brief summary of the flight profile.
-2. What Went Well: Highlight 2-3 positive aspects with specifics.
-3. Event Analysis: For each critical/warning/info event, explain the concern and **cite the relevant regulatory reference by number** (e.g., "According to [1], steep turns require..."). Use the snippets to provide authoritative guidance.
-4. Training Recommendations: Three concrete, actionable items for next flight.
-5. Closing: Professional yet encouraging safety notes.
-
-IMPORTANT: Actively reference and cite the regulatory sources provided above using [1], [2], etc. notation. Make the citations feel natural and educational.
-
-Target length: 350-450 words.
-"""
-        return prompt
+            refs_body = "- None available\n"
+
+        return _PROMPT_TEMPLATE.format_map(
+            {
+                "duration_minutes": flight_summary.get("total_duration_minutes", 0),
+                "max_altitude_ft": flight_summary.get("max_altitude_ft", 0),
+                "max_airspeed_kt": flight_summary.get("max_airspeed_kt", 0),
+                "max_bank_angle_deg": flight_summary.get("max_bank_angle_deg", 0),
+                "max_positive_g": flight_summary.get("max_positive_g", 1.0),
+                "fuel_consumed_gal": flight_summary.get("fuel_consumed_gal", 0),
+                "critical_count": len(critical),
+                "critical_events": self._format_events(critical),
+                "warning_count": len(warning),
+                "warning_events": self._format_events(warning),
+                "info_count": len(info),
+                "info_events": self._format_events(info),
+                "refs_text": _REFERENCES_HEADER + refs_body,
+            }
+        )
 
     @staticmethod
     def _format_events(events: List[Dict[str, Any]]) -> str:
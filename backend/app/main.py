@@ -1,14 +1,23 @@
 """Mission Debrief AI backend entrypoint."""
 from __future__ import annotations
 
+import asyncio
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import hashlib
+import heapq
 import logging
-from typing import Any, Dict, List, Optional
+import textwrap
+from typing import Any, BinaryIO, Dict, FrozenSet, List, Optional, Tuple
 
 from fastapi import FastAPI, File, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import numpy as np
 
 from .config import get_settings
-from .events import FlightEventDetector, compute_flight_summary
+from .events import FlightArrays, FlightEventDetector, compute_flight_summary
 from .flight_parser import parse_flight_with_metadata
 from .gemini_client import GeminiDebriefGenerator
 from .you_client import YoucomSearchClient
@@ -26,7 +35,15 @@ settings = get_settings()
 logging.basicConfig(level=settings.log_level)
 logger = logging.getLogger("mission-debrief-ai")
 
-app = FastAPI(title="navi-gAItor", version="0.1.0", description="Flight analysis backend")
+# CPU-bound analysis stages run here so they don't block the event loop
+CPU_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="analyze")
+
+app = FastAPI(
+    title="navi-gAItor",
+    version="0.1.0",
+    description="Flight analysis backend",
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -37,7 +54,18 @@ app.add_middleware(
 )
 
 
-def _build_chart_series(df) -> List[Dict[str, Any]]:
+# Clients are built once and reused; a constructor that raises (e.g. missing key) is not cached and retries next request
+@lru_cache(maxsize=1)
+def _gemini() -> GeminiDebriefGenerator:
+    return GeminiDebriefGenerator()
+
+
+@lru_cache(maxsize=1)
+def _you() -> YoucomSearchClient:
+    return YoucomSearchClient()
+
+
+def _build_chart_series(df, col_set: FrozenSet[str]) -> Dict[str, np.ndarray]:
     chart_columns = [
         "time_seconds",
         "alt_msl_ft",
@@ -46,44 +74,60 @@ def _build_chart_series(df) -> List[Dict[str, Any]]:
         "roll_deg",
         "pitch_deg",
     ]
-    available = [col for col in chart_columns if col in df.columns]
+    available = [col for col in chart_columns if col in col_set]
     step = max(1, len(df) // settings.max_chart_points)
-    return df[available].iloc[::step].to_dict(orient="records")
+    strided = df[available].iloc[::step]
+    return {column: np.ascontiguousarray(strided[column].to_numpy()) for column in available}
+
+
+def _build_risk_trace(df, col_set: FrozenSet[str]) -> Dict[str, np.ndarray]:
+    if "hf_index" not in col_set:
+        return {}
+    # Merged into the signal strip, so it shares that chart's resolution
+    step = max(1, len(df) // settings.max_signal_points)
+    strided = df[["time_seconds", "hf_index"]].iloc[::step].fillna(0)
+    return {column: np.ascontiguousarray(strided[column].to_numpy()) for column in strided.columns}
 
 
 _DEF_SEVERITY_PRIORITY = {"critical": 0, "warning": 1, "info": 2}
+_DEF_SEVERITY_KEYS = ["critical", "warning", "info"]
 
 
-def _select_event_types_for_references(events: List[Dict[str, Any]]) -> List[str]:
-    ordered = sorted(
-        events,
-        key=lambda event: (
-            _DEF_SEVERITY_PRIORITY.get(event.get("severity", "info"), 2),
-            event.get("time_seconds", 0.0),
-        ),
+def _event_rank(event: Dict[str, Any]) -> Tuple[int, float]:
+    return (
+        _DEF_SEVERITY_PRIORITY.get(event.get("severity", "info"), 2),
+        event.get("time_seconds", 0.0),
     )
-    unique: List[str] = []
-    for event in ordered:
+
+
+def _index_events(
+    events: List[Dict[str, Any]],
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Tuple[int, float]], Counter]:
+    """Single pass over the events: the top-ranked event per type, its rank, and a severity tally."""
+    by_type: Dict[str, Dict[str, Any]] = {}
+    best_rank: Dict[str, Tuple[int, float]] = {}
+    severities: Counter = Counter()
+    for event in events:
+        severities[event.get("severity", "info").lower()] += 1
         event_type = event.get("type")
-        if not event_type or event_type in unique:
+        if not event_type:
             continue
-        unique.append(event_type)
-        if len(unique) >= settings.max_reference_event_types:
-            break
-    if not unique and events:
-        unique.append(events[0].get("type"))
-    return unique
+        rank = _event_rank(event)
+        best = best_rank.get(event_type)
+        if best is None or rank < best:
+            best_rank[event_type] = rank
+            by_type[event_type] = event
+    return by_type, best_rank, severities
 
 
-_DEF_SEVERITY_KEYS = ["critical", "warning", "info"]
+def _select_event_types_for_references(best_rank: Dict[str, Tuple[int, float]]) -> List[str]:
+    return heapq.nsmallest(settings.max_reference_event_types, best_rank, key=best_rank.__getitem__)
 
 
-def _count_severity(events: List[Dict[str, Any]], extra: List[Dict[str, Any]]) -> Dict[str, int]:
-    counts = {key: 0 for key in _DEF_SEVERITY_KEYS}
-    for entry in events + extra:
-        severity = entry.get("severity", "info").lower()
-        counts[severity] = counts.get(severity, 0) + 1
-    counts["total"] = sum(counts.values())
+def _count_severity(severities: Counter) -> Dict[str, int]:
+    counts = dict.fromkeys(_DEF_SEVERITY_KEYS, 0)
+    counts.update(severities)
+    counts["total"] = sum(severities.values())
     return counts
 
 
@@ -97,15 +141,11 @@ def health() -> Dict[str, str]:
     return {"status": "healthy"}
 
 
-@app.post("/analyze")
-async def analyze_flight(file: UploadFile = File(...)) -> Dict[str, Any]:
-    logger.info("Analyzing file %s", file.filename)
-    file_bytes = await file.read()
-    if not file_bytes:
-        raise HTTPException(status_code=400, detail="Uploaded file is empty")
-
+async def _analyze_upload(stream: BinaryIO) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """Everything /analyze returns except references and the debrief, plus the events to look references up for."""
+    loop = asyncio.get_running_loop()
     try:
-        df, metadata = parse_flight_with_metadata(file_bytes)
+        df, metadata = await loop.run_in_executor(CPU_POOL, parse_flight_with_metadata, stream)
     except Exception as exc:
         logger.exception("Parsing failed")
         raise HTTPException(status_code=400, detail=f"Failed to parse CSV: {exc}") from exc
@@ -113,70 +153,136 @@ async def analyze_flight(file: UploadFile = File(...)) -> Dict[str, Any]:
     if df.empty:
         raise HTTPException(status_code=400, detail="No telemetry data found")
 
-    df = df.copy()
-    df["hf_index"] = compute_hf_index(df)
-
-    detector = FlightEventDetector(df)
-    events = detector.detect_all_events()
-    summary = compute_flight_summary(df)
-    signal_meta, signal_matrix = build_signal_payload(df, metadata.get("detected_aircraft", "CIRRUS_SR20"))
-    risk_trace = (
-        df[["time_seconds", "hf_index"]]
-        .fillna(0)
-        .to_dict(orient="records")
-        if "hf_index" in df.columns
-        else []
+    # Column membership is checked against one shared set instead of df.columns in every helper
+    col_set = frozenset(df.columns)
+    hf_index = await loop.run_in_executor(CPU_POOL, compute_hf_index, df, col_set)
+    # The parser returns a fresh frame owned by this request, so the column is added in place
+    df["hf_index"] = hf_index.to_numpy()
+    col_set |= {"hf_index"}
+
+    arrays = FlightArrays.from_frame(df)
+    detector = FlightEventDetector(df, arrays)
+    aircraft_type = metadata.get("detected_aircraft", "CIRRUS_SR20")
+    events, summary, (signal_meta, signal_matrix), risk_trace, rule_events, presets = await asyncio.gather(
+        loop.run_in_executor(CPU_POOL, detector.detect_all_events),
+        loop.run_in_executor(CPU_POOL, compute_flight_summary, df, arrays),
+        loop.run_in_executor(CPU_POOL, build_signal_payload, df, aircraft_type, settings.max_signal_points, col_set),
+        loop.run_in_executor(CPU_POOL, _build_risk_trace, df, col_set),
+        loop.run_in_executor(CPU_POOL, generate_rule_events, df, col_set),
+        loop.run_in_executor(CPU_POOL, build_presets, df, col_set),
     )
-    rule_events = generate_rule_events(df)
-    presets = build_presets(df)
 
-    severity_counts = _count_severity(events, rule_events)
+    by_type, best_rank, severities = _index_events(events + rule_events)
+    severity_counts = _count_severity(severities)
 
-    references: List[Dict[str, Any]] = []
-    try:
-        combined_events = events + rule_events
-        logger.info(f"Total events for You.com selection: {len(combined_events)} (detector: {len(events)}, rule: {len(rule_events)})")
-        event_types = _select_event_types_for_references(combined_events)
-        logger.info(f"Selected {len(event_types)} event types for You.com: {event_types}")
-        if event_types:
-            you_client = YoucomSearchClient()
-            for event_type in event_types:
-                first_event = next((e for e in combined_events if e.get("type") == event_type), None)
-                if not first_event:
-                    continue
-                logger.info(f"Fetching You.com references for {event_type}")
-                refs = you_client.search_for_event(event_type, first_event)
-                logger.info(f"You.com returned {len(refs)} references for {event_type}")
-                references.extend(refs)
-        else:
-            logger.info("No events qualified for You.com references")
-    except Exception as exc:
-        logger.warning("Reference lookup failed: %s", exc, exc_info=True)
+    logger.info(f"Total events for You.com selection: {severity_counts['total']} (detector: {len(events)}, rule: {len(rule_events)})")
+    event_types = _select_event_types_for_references(best_rank)
+    logger.info(f"Selected {len(event_types)} event types for You.com: {event_types}")
+    reference_events = {event_type: by_type[event_type] for event_type in event_types}
 
-    try:
-        gemini_client = GeminiDebriefGenerator()
-        debrief = gemini_client.generate_debrief(summary, events, references)
-    except Exception as exc:
-        logger.error("Gemini client error: %s", exc)
-        debrief = "Unable to generate AI debrief. Check Gemini credentials."
-
-    response = {
-        "success": True,
-        "filename": file.filename,
+    analysis = {
         "metadata": metadata,
         "summary": summary,
         "events": events,
         "events_count": severity_counts,
-        "references": references,
-        "debrief": debrief,
-        "series_data": _build_chart_series(df),
+        "series_data": _build_chart_series(df, col_set),
         "signal_meta": signal_meta,
         "signal_matrix": signal_matrix,
         "risk_trace": risk_trace,
-        "rule_events": rule_events,
+        "rule_events": rule_events[: settings.max_rule_events],
         "presets": presets,
     }
-    return response
+    return analysis, reference_events
+
+
+async def _fetch_references(reference_events: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Look up You.com references; run on every request so a failed lookup is not cached with the analysis."""
+    references: List[Dict[str, Any]] = []
+    if not reference_events:
+        logger.info("No events qualified for You.com references")
+        return references
+    try:
+        # Client construction can block, so it happens off the event loop like the searches
+        you_client = await asyncio.to_thread(_you)
+        lookups = []
+        for event_type, event in reference_events.items():
+            logger.info(f"Fetching You.com references for {event_type}")
+            lookups.append((event_type, asyncio.to_thread(you_client.search_for_event, event_type, event)))
+        results = await asyncio.gather(*(lookup for _, lookup in lookups))
+        for (event_type, _), refs in zip(lookups, results):
+            logger.info(f"You.com returned {len(refs)} references for {event_type}")
+            references.extend(refs)
+    except Exception as exc:
+        logger.warning("Reference lookup failed: %s", exc, exc_info=True)
+    return references
+
+
+_DIGEST_CHUNK = 1 << 20
+
+
+def _content_digest(stream: BinaryIO) -> bytes:
+    """Hash an upload in 1 MiB chunks and rewind it, so large files are never held as one ``bytes``."""
+    digest = hashlib.blake2b(digest_size=16)
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(_DIGEST_CHUNK), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.digest()
+
+
+# Analysis and reference candidates keyed by upload digest; only touched from the event loop
+_ANALYSIS_CACHE: "OrderedDict[bytes, Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]]" = OrderedDict()
+
+
+@app.post("/analyze")
+async def analyze_flight(file: UploadFile = File(...)) -> ORJSONResponse:
+    logger.info("Analyzing file %s", file.filename)
+    # UploadFile is already spooled to a temp file; stream it rather than reading it into memory
+    stream = file.file
+    if not stream.read(1):
+        raise HTTPException(status_code=400, detail="Uploaded file is empty")
+
+    key = await asyncio.get_running_loop().run_in_executor(CPU_POOL, _content_digest, stream)
+    cached = _ANALYSIS_CACHE.get(key)
+    if cached is not None:
+        logger.info("Reusing cached analysis for %s", file.filename)
+        _ANALYSIS_CACHE.move_to_end(key)
+    else:
+        cached = await _analyze_upload(stream)
+        _ANALYSIS_CACHE[key] = cached
+        while len(_ANALYSIS_CACHE) > settings.analysis_cache_size:
+            _ANALYSIS_CACHE.popitem(last=False)
+    analysis, reference_events = cached
+
+    references = await _fetch_references(reference_events)
+
+    try:
+        debrief = await asyncio.to_thread(
+            lambda: _gemini().generate_debrief(analysis["summary"], analysis["events"], references)
+        )
+    except Exception as exc:
+        logger.error("Gemini client error: %s", exc)
+        debrief = "Unable to generate AI debrief. Check Gemini credentials."
+
+    response = {"success": True, "filename": file.filename, **analysis, "references": references, "debrief": debrief}
+    # Returned directly so the NumPy columns skip jsonable_encoder and go straight to orjson
+    return ORJSONResponse(response)
+
+
+_AGENT_PROMPT_TEMPLATE = textwrap.dedent(
+    """\
+    You are a flight test engineer reviewing telemetry.
+    {window_text}
+    Command: {command}
+
+    Flight summary: {summary}
+
+    Recent rule events:
+    {rules_text}
+
+    Provide your response as structured log lines. Begin with an action verb (e.g., ANALYZE, NOTE, ALERT). Include bullet-style findings, cite signal names with units, and propose checks or comparisons where relevant.
+    """
+)
 
 
 class AiAgentRequest(BaseModel):
@@ -205,20 +311,15 @@ async def ai_agent_handler(payload: AiAgentRequest = Body(...)) -> Dict[str, Any
         ]
     )
 
-    prompt = f"""You are a flight test engineer reviewing telemetry.
-{window_text}
-Command: {command}
-
-Flight summary: {payload.summary}
-
-Recent rule events:\n{rules_text or 'None'}
-
-Provide your response as structured log lines. Begin with an action verb (e.g., ANALYZE, NOTE, ALERT). Include bullet-style findings, cite signal names with units, and propose checks or comparisons where relevant.
-"""
+    prompt = _AGENT_PROMPT_TEMPLATE.format(
+        window_text=window_text,
+        command=command,
+        summary=payload.summary,
+        rules_text=rules_text or "None",
+    )
 
     try:
-        gemini_client = GeminiDebriefGenerator()
-        response_text = gemini_client.generate_text(prompt)
+        response_text = await asyncio.to_thread(lambda: _gemini().generate_text(prompt))
     except Exception as exc:
         logger.error("Gemini agent error: %s", exc)
         raise HTTPException(status_code=500, detail=str(exc))
@@ -1,12 +1,13 @@
 """Risk scoring and rule-based events for Mission Debrief AI."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from ._event_kernels import hf_index as hf_kernel
+
 GA_SIGNALS = [
     ("alt_msl_ft", "Altitude", "ft", "left"),
     ("airspeed_indicated_kt", "Airspeed", "kt", "right"),
@@ -27,173 +28,229 @@ T38_SIGNALS = [
 ]
 
 
-def _column_exists(df: pd.DataFrame, column: str) -> bool:
-    return column in df.columns
+def _col_set(df: pd.DataFrame, col_set: Optional[FrozenSet[str]]) -> FrozenSet[str]:
+    """Column names to test membership against; callers share one precomputed set when they can."""
+    return frozenset(df.columns) if col_set is None else col_set
+
 
+# (column, offset, scale, take_abs): each component is clip(|x - offset| / scale, 0, 1.2)
+HF_COMPONENTS = [
+    ("vertical_speed_fpm", 0.0, 1500.0, True),
+    ("roll_deg", 0.0, 45.0, True),
+    ("normal_accel_g", 1.0, 1.5, True),
+    ("adc_aoa_corrected", 0.0, 15.0, False),
+    ("nz_normal_accel", 0.0, 4.0, True),
+]
 
-def compute_hf_index(df: pd.DataFrame) -> pd.Series:
+
+def compute_hf_index(df: pd.DataFrame, col_set: Optional[FrozenSet[str]] = None) -> pd.Series:
     """Compute a simple human-factor risk index (0-100)."""
 
-    components = []
-    if _column_exists(df, "vertical_speed_fpm"):
-        components.append(np.clip(np.abs(df["vertical_speed_fpm"]) / 1500, 0, 1.2))
-    if _column_exists(df, "roll_deg"):
-        components.append(np.clip(np.abs(df["roll_deg"]) / 45, 0, 1.2))
-    if _column_exists(df, "normal_accel_g"):
-        components.append(np.clip(np.abs(df["normal_accel_g"] - 1.0) / 1.5, 0, 1.2))
-    if _column_exists(df, "adc_aoa_corrected"):
-        components.append(np.clip(df["adc_aoa_corrected"] / 15.0, 0, 1.2))
-    if _column_exists(df, "nz_normal_accel"):
-        components.append(np.clip(np.abs(df["nz_normal_accel"]) / 4.0, 0, 1.2))
-
-    if not components:
+    n = len(df)
+    col_set = _col_set(df, col_set)
+    present = np.array([column in col_set for column, *_ in HF_COMPONENTS])
+    if not present.any():
         return pd.Series(np.zeros(len(df)))
 
-    stacked = np.vstack([c.fillna(0).to_numpy() for c in components])
-    score = stacked.mean(axis=0)
-    return pd.Series(np.clip(score * 80 + 10, 0, 100), index=df.index)
-
-
-@dataclass
-class RuleEvent:
-    rule: str
-    severity: str
-    timestamp: float
-    description: str
-    values: Dict[str, Any]
-
-    def as_dict(self) -> Dict[str, Any]:
-        return {
-            "rule": self.rule,
-            "severity": self.severity,
-            "time_seconds": self.timestamp,
-            "description": self.description,
-            "values": self.values,
-        }
-
-
-def _value(df: pd.DataFrame, column: str, idx: int, default: Optional[float] = None) -> Optional[float]:
-    if column in df.columns:
-        value = df.iloc[idx][column]
-        if pd.isna(value):
-            return default
-        return float(value)
-    return default
-
-
-def generate_rule_events(df: pd.DataFrame) -> List[Dict[str, Any]]:
-    events: List[RuleEvent] = []
-    if "hf_index" in df.columns:
-        risk_segment = df[df["hf_index"] > 60]
-        for idx in risk_segment.index:
-            hf_value = float(df.loc[idx, "hf_index"])
-            if hf_value >= 90:
-                severity = "critical"
-            elif hf_value >= 75:
-                severity = "warning"
-            else:
-                severity = "info"
-            events.append(
-                RuleEvent(
-                    rule="HF_RISK_HIGH",
-                    severity=severity,
-                    timestamp=float(df.loc[idx, "time_seconds"]),
-                    description="Human-factor risk exceeds threshold",
-                    values={"hf_index": round(hf_value, 1)},
+    if hf_kernel is not None:
+        empty = np.empty(0, dtype=np.float32)
+        columns = [
+            np.ascontiguousarray(df[column].to_numpy(), dtype=np.float32) if has else empty
+            for (column, *_), has in zip(HF_COMPONENTS, present)
+        ]
+        params = np.array([component[1:] for component in HF_COMPONENTS], dtype=np.float64)
+        return pd.Series(hf_kernel(n, *columns, present, params), index=df.index)
+
+    score = np.zeros(n, dtype=np.float32)
+    tmp = np.empty(n, dtype=np.float32)
+    count = 0
+    for column, offset, scale, take_abs in HF_COMPONENTS:
+        if column not in col_set:
+            continue
+        # Read the column as a view and let the ufunc cast into the float32 scratch buffer
+        np.subtract(df[column].to_numpy(copy=False), offset, out=tmp, casting="same_kind")
+        if take_abs:
+            np.abs(tmp, out=tmp)
+        np.divide(tmp, scale, out=tmp)
+        np.clip(tmp, 0.0, 1.2, out=tmp)
+        np.nan_to_num(tmp, copy=False, nan=0.0)
+        score += tmp
+        count += 1
+
+    np.multiply(score, 80.0 / count, out=score)
+    np.add(score, 10.0, out=score)
+    np.clip(score, 0, 100, out=score)
+    return pd.Series(score, index=df.index)
+
+
+_SEVERITY_LEVELS = np.array(["info", "warning", "critical"])
+
+
+def _excursions(mask: np.ndarray, score: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and peak positions of each contiguous run of ``mask``.
+
+    The peak is the sample with the highest ``score`` inside the run.
+    """
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    peaks = np.array([s + int(np.argmax(score[s:e])) for s, e in zip(starts, ends)], dtype=np.int64)
+    return starts, peaks
+
+
+def generate_rule_events(df: pd.DataFrame, col_set: Optional[FrozenSet[str]] = None) -> List[Dict[str, Any]]:
+    """Emit one rule event per contiguous excursion, stamped at its start and valued at its peak."""
+    col_set = _col_set(df, col_set)
+    # One (timestamps, events) pair per rule; merged by a single argsort at the end
+    chunks: List[Tuple[np.ndarray, List[Dict[str, Any]]]] = []
+    time_seconds = df["time_seconds"].to_numpy()
+
+    if "hf_index" in col_set:
+        hf = df["hf_index"].to_numpy()
+        level = np.select([hf >= 90, hf >= 75], [2, 1], 0)
+        starts, peaks = _excursions(hf > 60, hf)
+        timestamps = time_seconds[starts]
+        chunks.append((
+            timestamps,
+            [
+                {
+                    "rule": "HF_RISK_HIGH",
+                    "severity": severity,
+                    "time_seconds": timestamp,
+                    "description": "Human-factor risk exceeds threshold",
+                    "values": {"hf_index": round(hf_value, 1)},
+                }
+                for timestamp, hf_value, severity in zip(
+                    timestamps.tolist(), hf[peaks].tolist(), _SEVERITY_LEVELS[level[peaks]].tolist()
                 )
-            )
-
-    if {"roll_deg", "alt_msl_ft"}.issubset(df.columns):
-        low_alt_bank = df[(df["alt_msl_ft"] < 900) & (df["roll_deg"].abs() > 25)]
-        for idx in low_alt_bank.index:
-            alt_ft = float(df.loc[idx, "alt_msl_ft"])
-            bank = abs(float(df.loc[idx, "roll_deg"]))
-            if alt_ft < 400 and bank >= 45:
-                severity = "critical"
-            elif alt_ft < 800 and bank >= 30:
-                severity = "warning"
-            else:
-                severity = "info"
-            events.append(
-                RuleEvent(
-                    rule="LOW_ALTITUDE_BANK",
-                    severity=severity,
-                    timestamp=float(df.loc[idx, "time_seconds"]),
-                    description="Steep bank near the ground",
-                    values={
+            ],
+        ))
+
+    if {"roll_deg", "alt_msl_ft"} <= col_set:
+        alt = df["alt_msl_ft"].to_numpy()
+        bank = np.abs(df["roll_deg"].to_numpy())
+        level = np.select([(alt < 400) & (bank >= 45), (alt < 800) & (bank >= 30)], [2, 1], 0)
+        starts, peaks = _excursions((alt < 900) & (bank > 25), level * 1000 + bank)
+        timestamps = time_seconds[starts]
+        chunks.append((
+            timestamps,
+            [
+                {
+                    "rule": "LOW_ALTITUDE_BANK",
+                    "severity": severity,
+                    "time_seconds": timestamp,
+                    "description": "Steep bank near the ground",
+                    "values": {
                         "alt_ft": round(alt_ft, 0),
-                        "bank_deg": round(bank, 1),
+                        "bank_deg": round(bank_deg, 1),
                     },
+                }
+                for timestamp, alt_ft, bank_deg, severity in zip(
+                    timestamps.tolist(),
+                    alt[peaks].tolist(),
+                    bank[peaks].tolist(),
+                    _SEVERITY_LEVELS[level[peaks]].tolist(),
                 )
-            )
-
-    if {"adc_aoa_corrected", "nz_normal_accel"}.issubset(df.columns):
-        aoa_margin = df[(df["adc_aoa_corrected"] > 12) & (df["nz_normal_accel"] > 2.5)]
-        for idx in aoa_margin.index:
-            aoa = float(df.loc[idx, "adc_aoa_corrected"])
-            nz = float(df.loc[idx, "nz_normal_accel"])
-            if aoa >= 18 or nz >= 3.5:
-                severity = "critical"
-            elif aoa >= 15 or nz >= 3.0:
-                severity = "warning"
-            else:
-                severity = "info"
-            events.append(
-                RuleEvent(
-                    rule="AOA_MARGIN_LOW",
-                    severity=severity,
-                    timestamp=float(df.loc[idx, "time_seconds"]),
-                    description="High AOA with elevated Nz",
-                    values={
-                        "aoa_deg": round(aoa, 1),
-                        "nz_g": round(nz, 2),
+            ],
+        ))
+
+    if {"adc_aoa_corrected", "nz_normal_accel"} <= col_set:
+        aoa = df["adc_aoa_corrected"].to_numpy()
+        nz = df["nz_normal_accel"].to_numpy()
+        level = np.select([(aoa >= 18) | (nz >= 3.5), (aoa >= 15) | (nz >= 3.0)], [2, 1], 0)
+        starts, peaks = _excursions((aoa > 12) & (nz > 2.5), level * 1000 + aoa)
+        timestamps = time_seconds[starts]
+        chunks.append((
+            timestamps,
+            [
+                {
+                    "rule": "AOA_MARGIN_LOW",
+                    "severity": severity,
+                    "time_seconds": timestamp,
+                    "description": "High AOA with elevated Nz",
+                    "values": {
+                        "aoa_deg": round(aoa_deg, 1),
+                        "nz_g": round(nz_g, 2),
                     },
+                }
+                for timestamp, aoa_deg, nz_g, severity in zip(
+                    timestamps.tolist(),
+                    aoa[peaks].tolist(),
+                    nz[peaks].tolist(),
+                    _SEVERITY_LEVELS[level[peaks]].tolist(),
                 )
-            )
-
-    return [event.as_dict() for event in sorted(events, key=lambda e: e.timestamp)]
-
-
-def build_signal_payload(df: pd.DataFrame, aircraft_type: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+            ],
+        ))
+
+    if not chunks:
+        return []
+    order = np.argsort(np.concatenate([timestamps for timestamps, _ in chunks]), kind="stable")
+    events = [event for _, rule_events in chunks for event in rule_events]
+    return [events[i] for i in order.tolist()]
+
+
+def build_signal_payload(
+    df: pd.DataFrame,
+    aircraft_type: str,
+    max_points: Optional[int] = None,
+    col_set: Optional[FrozenSet[str]] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, np.ndarray]]:
+    """Signal metadata and per-column arrays for the signal chart, strided to ``max_points`` rows when given."""
     signals = T38_SIGNALS if aircraft_type == "T38C" else GA_SIGNALS
-    available_signals = [s for s in signals if _column_exists(df, s[0])]
+    col_set = _col_set(df, col_set)
+    available_signals = [s for s in signals if s[0] in col_set]
 
     matrix_columns = ["time_seconds"] + [key for key, *_ in available_signals]
-    signal_matrix = df[matrix_columns].copy().fillna(method="ffill").fillna(method="bfill")
+    step = max(1, len(df) // max_points) if max_points else 1
+    matrix = df[matrix_columns].to_numpy(dtype=np.float32)
+    # Fill at full resolution before striding so sparse channels keep their samples
+    matrix = _ffill(_ffill(matrix)[::-1])[::-1][::step]  # forward fill, then back fill leading gaps
 
     meta = [
         {"key": key, "label": label, "unit": unit, "axis": axis}
         for key, label, unit, axis in available_signals
     ]
 
-    data = signal_matrix.to_dict(orient="records")
+    data = {column: np.ascontiguousarray(matrix[:, i]) for i, column in enumerate(matrix_columns)}
     return meta, data
 
 
-def build_presets(df: pd.DataFrame) -> List[Dict[str, Any]]:
+def _ffill(matrix: np.ndarray) -> np.ndarray:
+    """Column-wise forward fill of NaNs in a 2-D array."""
+    rows = np.arange(matrix.shape[0])[:, None]
+    last_valid = np.where(np.isnan(matrix), 0, rows)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    return matrix[last_valid, np.arange(matrix.shape[1])]
+
+
+def build_presets(df: pd.DataFrame, col_set: Optional[FrozenSet[str]] = None) -> List[Dict[str, Any]]:
     presets: List[Dict[str, Any]] = []
+    col_set = _col_set(df, col_set)
     duration = float(df["time_seconds"].max()) if not df.empty else 0
 
     def clamp_window(start: float, length: float = 30) -> Tuple[float, float]:
         end = min(duration, start + length)
         return (start, end)
 
-    if "vertical_speed_fpm" in df.columns:
-        climb = df[df["vertical_speed_fpm"] > 300]
-        if not climb.empty:
-            start = float(climb.iloc[0]["time_seconds"])
+    times = df["time_seconds"].to_numpy()
+
+    if "vertical_speed_fpm" in col_set:
+        climb = df["vertical_speed_fpm"].to_numpy() > 300
+        if climb.any():
+            start = float(times[np.argmax(climb)])
             presets.append({"id": "takeoff", "label": "Takeoff", "window": clamp_window(start, 40)})
 
-    if "alt_msl_ft" in df.columns:
-        low_work = df[(df["alt_msl_ft"] > 200) & (df["alt_msl_ft"] < 1500)]
-        if not low_work.empty:
-            mid = float(low_work.iloc[len(low_work) // 2]["time_seconds"])
+    if "alt_msl_ft" in col_set:
+        alt = df["alt_msl_ft"].to_numpy()
+        low_work = np.flatnonzero((alt > 200) & (alt < 1500))
+        if low_work.size:
+            mid = float(times[low_work[low_work.size // 2]])
             presets.append({"id": "pattern", "label": "Pattern Work", "window": clamp_window(max(0, mid - 20), 40)})
 
-    if "adc_aoa_corrected" in df.columns:
-        high_aoa = df[df["adc_aoa_corrected"] > 12]
-        if not high_aoa.empty:
-            start = float(high_aoa.iloc[0]["time_seconds"] - 5)
+    if "adc_aoa_corrected" in col_set:
+        high_aoa = df["adc_aoa_corrected"].to_numpy() > 12
+        if high_aoa.any():
+            start = float(times[np.argmax(high_aoa)] - 5)
             presets.append({"id": "high_aoa", "label": "High-AoA", "window": clamp_window(max(0, start), 25)})
 
     if not presets and duration:
@@ -2,10 +2,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .config import get_settings
 
@@ -13,6 +16,16 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+@lru_cache(maxsize=4)
+def _shared_session(api_key: str) -> requests.Session:
+    """Keep-alive session per API key, reused across clients and worker threads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.2))
+    session.mount("https://", adapter)
+    session.headers.update({"X-API-Key": api_key})
+    return session
+
+
 @dataclass
 class YoucomResult:
     title: str
@@ -43,52 +56,64 @@ class YoucomSearchClient:
         "cirrusaircraft.com",
     ]
 
+    EVENT_QUERIES = {
+        "STEEP_TURN": "FAA steep turn tolerances ACS",
+        "OVERSPEED": "FAA Vne never exceed speed guidance",
+        "HIGH_G_LOAD": "FAA load factor normal category",
+        "STALL_WARNING": "FAA stall recovery procedure",
+        "LANDING": "FAA stabilized approach criteria",
+        "TAKEOFF": "FAA takeoff performance planning",
+        "HF_RISK_HIGH": "FAA pilot workload human factors safety",
+        "LOW_ALTITUDE_BANK": "FAA low altitude maneuvering safety steep turns",
+        "AOA_MARGIN_LOW": "FAA angle of attack stall margin safety",
+    }
+
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or settings.youcom_api_key
         if not self.api_key:
             raise ValueError("You.com API key not configured")
+        self._session = _shared_session(self.api_key)
 
     def search(self, query: str, *, num_results: int = 3, include_domains: Optional[List[str]] = None) -> Dict[str, Any]:
-        headers = {
-            "X-API-Key": self.api_key,
-        }
-        params = {
-            "query": query,
-            "count": num_results,
-        }
         try:
-            response = requests.get(self.API_URL, headers=headers, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            web_results = data.get("results", {}).get("web", [])
-            return {"hits": web_results}
+            return {"hits": _fetch_hits(self._session, query, num_results)}
         except requests.RequestException as exc:
             logger.warning("You.com search failed: %s", exc)
             return {"hits": [], "error": str(exc)}
 
-    def search_for_event(self, event_type: str, event_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        queries = {
-            "STEEP_TURN": "FAA steep turn tolerances ACS",
-            "OVERSPEED": "FAA Vne never exceed speed guidance",
-            "HIGH_G_LOAD": "FAA load factor normal category",
-            "STALL_WARNING": "FAA stall recovery procedure",
-            "LANDING": "FAA stabilized approach criteria",
-            "TAKEOFF": "FAA takeoff performance planning",
-            "HF_RISK_HIGH": "FAA pilot workload human factors safety",
-            "LOW_ALTITUDE_BANK": "FAA low altitude maneuvering safety steep turns",
-            "AOA_MARGIN_LOW": "FAA angle of attack stall margin safety",
-        }
-        query = queries.get(event_type, f"FAA {event_type.replace('_', ' ')} aviation safety")
-        results = self.search(query, num_results=2)
-        snippets: List[Dict[str, Any]] = []
-        for item in results.get("hits", [])[:2]:
-            snippets.append(
-                YoucomResult(
-                    title=item.get("title", ""),
-                    url=item.get("url", ""),
-                    snippet=item.get("description", ""),
-                    domain=item.get("url", "").split("/")[2] if item.get("url") else "",
-                    event_type=event_type,
-                ).as_dict()
-            )
-        return snippets
+    def search_for_event(self, event_type: str, event_data: Dict[str, Any], *, num_results: int = 2) -> List[Dict[str, Any]]:
+        # The query depends only on the event type, so results are cached per type
+        try:
+            snippets = _cached_event_search(event_type, num_results, self.api_key)
+        except requests.RequestException as exc:
+            logger.warning("You.com search failed: %s", exc)
+            return []
+        return [dict(snippet) for snippet in snippets]
+
+
+def _fetch_hits(session: requests.Session, query: str, num_results: int) -> List[Dict[str, Any]]:
+    params = {
+        "query": query,
+        "count": num_results,
+    }
+    response = session.get(YoucomSearchClient.API_URL, params=params, timeout=10)
+    response.raise_for_status()
+    data = response.json()
+    return data.get("results", {}).get("web", [])
+
+
+@lru_cache(maxsize=256)
+def _cached_event_search(event_type: str, num_results: int, api_key: str) -> Tuple[Dict[str, Any], ...]:
+    """Search results for an event type; failures raise and are therefore not cached."""
+    query = YoucomSearchClient.EVENT_QUERIES.get(event_type, f"FAA {event_type.replace('_', ' ')} aviation safety")
+    hits = _fetch_hits(_shared_session(api_key), query, num_results)
+    return tuple(
+        YoucomResult(
+            title=item.get("title", ""),
+            url=item.get("url", ""),
+            snippet=item.get("description", ""),
+            domain=item.get("url", "").split("/")[2] if item.get("url") else "",
+            event_type=event_type,
+        ).as_dict()
+        for item in hits[:num_results]
+    )
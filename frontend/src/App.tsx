@@ -44,7 +44,7 @@ function App() {
 
   useEffect(() => {
     if (!result) return;
-    const duration = result.signal_matrix.at(-1)?.time_seconds ?? result.series_data.at(-1)?.time_seconds ?? 0;
+    const duration = result.signal_matrix.time_seconds.at(-1) ?? result.series_data.time_seconds.at(-1) ?? 0;
     const defaultWindow = result.presets?.[0]?.window ?? [0, duration];
     setWindowRange(defaultWindow);
     setCursorTime(defaultWindow[0]);
@@ -53,7 +53,7 @@ function App() {
   const presets = useMemo(() => {
     if (!result) return [];
     const duration =
-      result.signal_matrix.at(-1)?.time_seconds ?? result.series_data.at(-1)?.time_seconds ?? 0;
+      result.signal_matrix.time_seconds.at(-1) ?? result.series_data.time_seconds.at(-1) ?? 0;
     if (result.presets && result.presets.length > 0) return result.presets;
     return [{ id: 'full', label: 'Full Flight', window: [0, duration] as [number, number] }];
   }, [result]);
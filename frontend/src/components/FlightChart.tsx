@@ -1,3 +1,4 @@
+import { useMemo } from 'react';
 import {
   LineChart,
   Line,
@@ -9,10 +10,11 @@ import {
   ReferenceLine,
   CartesianGrid,
 } from 'recharts';
-import type { FlightEvent, SeriesPoint } from '../types';
+import { columnsToRows } from '../lib/columns';
+import type { FlightEvent, SeriesColumns, SeriesPoint } from '../types';
 
 interface FlightChartProps {
-  data: SeriesPoint[];
+  data: SeriesColumns;
   events: FlightEvent[];
 }
 
@@ -23,7 +25,9 @@ const formatter = (tick: number) => {
 };
 
 export function FlightChart({ data, events }: FlightChartProps) {
-  if (!data.length) {
+  const rows = useMemo(() => columnsToRows<SeriesPoint>(data), [data]);
+
+  if (!rows.length) {
     return null;
   }
 
@@ -39,7 +43,7 @@ export function FlightChart({ data, events }: FlightChartProps) {
       </div>
       <div className="chart-wrapper">
         <ResponsiveContainer width="100%" height={360}>
-          <LineChart data={data}>
+          <LineChart data={rows}>
             <CartesianGrid strokeDasharray="3 3" stroke="rgba(255,255,255,0.08)" />
             <XAxis dataKey="time_seconds" tickFormatter={formatter} stroke="rgba(255,255,255,0.4)" />
             <YAxis yAxisId="left" stroke="rgba(33,150,243,0.7)" tickFormatter={(v) => `${v} ft`} />
@@ -49,7 +53,7 @@ export function FlightChart({ data, events }: FlightChartProps) {
               labelFormatter={(value) => `T+ ${formatter(Number(value))}`}
             />
             <Legend />
-            {data[0].alt_msl_ft !== undefined && (
+            {data.alt_msl_ft !== undefined && (
               <Line
                 yAxisId="left"
                 type="monotone"
@@ -60,7 +64,7 @@ export function FlightChart({ data, events }: FlightChartProps) {
                 strokeWidth={2}
               />
             )}
-            {data[0].airspeed_indicated_kt !== undefined && (
+            {data.airspeed_indicated_kt !== undefined && (
               <Line
                 yAxisId="right"
                 type="monotone"
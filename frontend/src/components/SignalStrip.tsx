@@ -12,19 +12,21 @@ import {
   Area,
   Legend,
 } from 'recharts';
+import { columnsToRows } from '../lib/columns';
 import type {
+  SignalMatrixColumns,
   SignalMatrixPoint,
   SignalMeta,
-  RiskPoint,
+  RiskTraceColumns,
   PresetWindow,
 } from '../types';
 
 const COLORS = ['#63c6ff', '#80ff8f', '#ffb347', '#d66bff', '#64d2f0', '#f77fbe'];
 
 type SignalStripProps = {
-  data: SignalMatrixPoint[];
+  data: SignalMatrixColumns;
   meta: SignalMeta[];
-  risk: RiskPoint[];
+  risk: RiskTraceColumns;
   cursor: number;
   onCursorChange: (time: number) => void;
   window: [number, number];
@@ -50,13 +52,15 @@ export function SignalStrip({
 }: SignalStripProps) {
   const riskLookup = useMemo(() => {
     const map = new Map<number, number>();
-    risk.forEach((point) => map.set(Number(point.time_seconds.toFixed(1)), point.hf_index));
+    const times = risk.time_seconds ?? [];
+    const values = risk.hf_index ?? [];
+    times.forEach((time, index) => map.set(Number(time.toFixed(1)), values[index]));
     return map;
   }, [risk]);
 
   const merged = useMemo(
     () =>
-      data.map((point) => ({
+      columnsToRows<SignalMatrixPoint>(data).map((point) => ({
         ...point,
         hf_index: riskLookup.get(Number(point.time_seconds.toFixed(1))) ?? 0,
       })),
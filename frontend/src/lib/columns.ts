@@ -0,0 +1,14 @@
+export type ColumnArrays = Record<string, ArrayLike<unknown> | undefined>;
+
+// Recharts wants one object per sample, so pivot column arrays back into rows on the client
+export function columnsToRows<T>(columns: ColumnArrays): T[] {
+  const keys = Object.keys(columns).filter((key) => columns[key] !== undefined);
+  const length = keys.reduce((max, key) => Math.max(max, columns[key]!.length), 0);
+  const rows = new Array<T>(length);
+  for (let i = 0; i < length; i += 1) {
+    const row: Record<string, unknown> = {};
+    for (const key of keys) row[key] = columns[key]![i];
+    rows[i] = row as T;
+  }
+  return rows;
+}
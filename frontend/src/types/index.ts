@@ -47,6 +47,16 @@ export interface SeriesPoint {
   pitch_deg?: number;
 }
 
+// A type alias (not an interface) so it stays assignable to the Record-based ColumnArrays
+export type SeriesColumns = {
+  time_seconds: number[];
+  alt_msl_ft?: Array<number | null>;
+  airspeed_indicated_kt?: Array<number | null>;
+  vertical_speed_fpm?: Array<number | null>;
+  roll_deg?: Array<number | null>;
+  pitch_deg?: Array<number | null>;
+};
+
 export interface SignalMeta {
   key: string;
   label: string;
@@ -56,7 +66,13 @@ export interface SignalMeta {
 
 export interface SignalMatrixPoint {
   time_seconds: number;
-  [key: string]: number | undefined;
+  [key: string]: number | null | undefined;
+}
+
+// Column-oriented payloads: one array per signal, all sharing the time_seconds index
+export interface SignalMatrixColumns {
+  time_seconds: number[];
+  [key: string]: Array<number | null>;
 }
 
 export interface RiskPoint {
@@ -64,6 +80,11 @@ export interface RiskPoint {
   hf_index: number;
 }
 
+export interface RiskTraceColumns {
+  time_seconds?: number[];
+  hf_index?: number[];
+}
+
 export interface PresetWindow {
   id: string;
   label: string;
@@ -84,10 +105,10 @@ export interface AnalysisResponse {
   };
   references: ReferenceSnippet[];
   debrief: string;
-  series_data: SeriesPoint[];
+  series_data: SeriesColumns;
   signal_meta: SignalMeta[];
-  signal_matrix: SignalMatrixPoint[];
-  risk_trace: RiskPoint[];
+  signal_matrix: SignalMatrixColumns;
+  risk_trace: RiskTraceColumns;
   rule_events: RuleEvent[];
   presets: PresetWindow[];
 }